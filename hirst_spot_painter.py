@@ -12,14 +12,220 @@ using given colors/image and display it to user. Also it gives interactive devel
 """
 __version__ = '0.2'
 
+import atexit
+import os
+import pickle
+import tkinter
 import turtle
 import math
-from random import choice, randint
-from colorthief import ColorThief
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+from PIL import Image, ImageDraw, ImageTk
+from random import choice
+from types import SimpleNamespace
 from typing import Sequence, Tuple, Union
 
+# fast-colorthief is a C++ implementation of MMCQ. It is optional,
+# if unavailable we fall back to the local NumPy implementation.
+try:
+    import fast_colorthief
+except ImportError:
+    fast_colorthief = None
 
-class HirstSpotPainter(turtle.Turtle):
+# scikit-learn is optional, needed only for the 'kmeans' quantizer.
+try:
+    from sklearn.cluster import MiniBatchKMeans
+except ImportError:
+    MiniBatchKMeans = None
+
+# numba is optional, when present the MMCQ split scans get jit compiled.
+try:
+    import numba
+except ImportError:
+    numba = None
+
+# On-disk cache for extracted palettes, shared across runs.
+_CACHE_FILE = os.path.join(os.path.expanduser('~'), '.cache', 'hirst_spot_painter', 'palettes.pkl')
+
+_TAU = math.tau
+
+
+def _load_pixels(image_file: str, stride: int) -> np.ndarray:
+    """
+    Loads RGB pixels from an image file, subsampled by stride.
+
+    The stride applies to both dimensions up front, so only about N/stride^2
+    pixels ever reach a quantizer instead of letting the quantizer skip every
+    stride-th pixel of the full image.
+
+    :param image_file: Takes an image file with location.
+    :param stride: Takes the subsampling stride. 1 keeps every pixel.
+    :return: An (N, 3) uint8 array of RGB pixels.
+    """
+    img = np.asarray(Image.open(image_file).convert('RGB'))
+    return img[::stride, ::stride].reshape(-1, 3)
+
+
+def _mmcq_split_point(hist: np.ndarray, r0: int, r1: int, g0: int, g1: int, b0: int, b1: int) -> tuple:
+    """
+    Finds the median cut point of a histogram box along its longest axis.
+
+    Written with plain loops so numba can compile it; interpreted it is the
+    fallback when numba is unavailable.
+
+    :param hist: Takes the 32x32x32 color histogram.
+    :return: An (axis, offset) pair. Offset is relative to the box start on
+             that axis, or -1 when the box is a single bin wide.
+    """
+    sizes = (r1 - r0, g1 - g0, b1 - b0)
+    axis = 0
+    if sizes[1] > sizes[axis]:
+        axis = 1
+    if sizes[2] > sizes[axis]:
+        axis = 2
+    if sizes[axis] == 0:
+        return axis, -1
+
+    bins = sizes[axis] + 1
+    marginal = np.zeros(bins, np.int64)
+    for r in range(r0, r1 + 1):
+        for g in range(g0, g1 + 1):
+            for b in range(b0, b1 + 1):
+                if axis == 0:
+                    marginal[r - r0] += hist[r, g, b]
+                elif axis == 1:
+                    marginal[g - g0] += hist[r, g, b]
+                else:
+                    marginal[b - b0] += hist[r, g, b]
+
+    half = marginal.sum() / 2
+    csum = 0
+    cut = bins - 2
+    for i in range(bins - 1):
+        csum += marginal[i]
+        if csum >= half:
+            cut = i
+            break
+    return axis, cut
+
+
+if numba:
+    _mmcq_split_point = numba.njit(cache=True)(_mmcq_split_point)
+
+
+def _mmcq_palette(pixels: np.ndarray, color_count: int) -> list:
+    """
+    Extracts a color palette with modified median cut quantization (MMCQ).
+
+    Builds the 5-bit-per-channel histogram in one np.bincount call on packed
+    15-bit indices instead of walking pixels in a Python loop, then runs the
+    median cut splits on histogram slices.
+
+    :param pixels: Takes an uint8 array of shape (N, 3) with RGB pixels.
+    :param color_count: Maximum number of colors in the palette.
+    :return: A list of RGB tuples.
+    """
+    packed = ((pixels[:, 0].astype(np.uint32) >> 3) << 10
+              | (pixels[:, 1].astype(np.uint32) >> 3) << 5
+              | (pixels[:, 2].astype(np.uint32) >> 3))
+    hist = np.bincount(packed, minlength=1 << 15).reshape(32, 32, 32)
+
+    def shrink(bounds):
+        # Trims a box down to its non-empty histogram planes.
+        r0, r1, g0, g1, b0, b1 = bounds
+        box = hist[r0:r1 + 1, g0:g1 + 1, b0:b1 + 1]
+        if not box.any():
+            return None
+        r = np.flatnonzero(box.sum(axis=(1, 2)))
+        g = np.flatnonzero(box.sum(axis=(0, 2)))
+        b = np.flatnonzero(box.sum(axis=(0, 1)))
+        return (r0 + r[0], r0 + r[-1], g0 + g[0], g0 + g[-1], b0 + b[0], b0 + b[-1])
+
+    def count(bounds):
+        r0, r1, g0, g1, b0, b1 = bounds
+        return int(hist[r0:r1 + 1, g0:g1 + 1, b0:b1 + 1].sum())
+
+    def volume(bounds):
+        r0, r1, g0, g1, b0, b1 = bounds
+        return (r1 - r0 + 1) * (g1 - g0 + 1) * (b1 - b0 + 1)
+
+    def split(bounds):
+        # Cuts a box at the median of its longest axis.
+        axis, cut = _mmcq_split_point(hist, *bounds)
+        if cut < 0:
+            return [bounds]
+        lower = list(bounds)
+        upper = lower.copy()
+        lower[axis * 2 + 1] = bounds[axis * 2] + cut
+        upper[axis * 2] = bounds[axis * 2] + cut + 1
+        return [b for b in (shrink(tuple(lower)), shrink(tuple(upper))) if b]
+
+    def iterate(boxes, key, target):
+        # Repeatedly splits the highest ranked box until target boxes exist.
+        while len(boxes) < target:
+            boxes.sort(key=key)
+            parts = split(boxes.pop())
+            boxes.extend(parts)
+            if len(parts) < 2:
+                break
+        return boxes
+
+    # Like colorthief, split by population first, then by population * volume.
+    boxes = [shrink((0, 31, 0, 31, 0, 31))]
+    boxes = iterate(boxes, count, math.ceil(0.75 * color_count))
+    boxes = iterate(boxes, lambda b: count(b) * volume(b), color_count)
+
+    palette = []
+    for r0, r1, g0, g1, b0, b1 in boxes:
+        box = hist[r0:r1 + 1, g0:g1 + 1, b0:b1 + 1]
+        total = box.sum()
+        palette.append(tuple(
+            int((box.sum(axis=axes) * (np.arange(lo, hi + 1) * 8 + 4)).sum() / total)
+            for lo, hi, axes in ((r0, r1, (1, 2)), (g0, g1, (0, 2)), (b0, b1, (0, 1)))))
+    return palette
+
+
+def _kmeans_palette(pixels: np.ndarray, color_count: int) -> list:
+    """
+    Extracts a color palette by clustering pixels with mini-batch k-means.
+
+    Mini-batches bound the per-iteration cost independent of image size, so
+    large images quantize in roughly constant time after subsampling.
+
+    :param pixels: Takes an uint8 array of shape (N, 3) with RGB pixels.
+    :param color_count: Number of cluster centers, i.e. palette colors.
+    :return: A list of RGB tuples.
+    """
+    kmeans = MiniBatchKMeans(n_clusters=color_count, batch_size=4096, n_init=1, max_iter=20)
+    kmeans.fit(pixels.astype(np.float32))
+    return [tuple(int(c) for c in center) for center in kmeans.cluster_centers_]
+
+
+def _extract_palette(image_file: str, color_count: int, quality: int, quantizer: str = 'mmcq') -> list:
+    """
+    Extracts a color palette from an image file with the given quantizer.
+
+    Module level so it can be shipped to worker processes by pickle.
+
+    :param image_file: Takes an image file with location.
+    :param color_count: Maximum number of colors in the palette.
+    :param quality: Takes the subsampling stride. 1 keeps every pixel.
+    :param quantizer: Takes a quantizer name, 'mmcq' or 'kmeans'.
+    :return: A list of RGB tuples.
+    """
+    pixels = _load_pixels(image_file, quality)
+    if quantizer == 'kmeans':
+        return _kmeans_palette(pixels, color_count)
+    if fast_colorthief:
+        # The backend wants RGBA image rows; quality 1 since the pixels are
+        # already subsampled.
+        rgba = np.concatenate((pixels, np.full((len(pixels), 1), 255, np.uint8)),
+                              axis=1).reshape(-1, 1, 4)
+        return fast_colorthief.get_palette(rgba, color_count, 1)
+    return _mmcq_palette(pixels, color_count)
+
+
+class HirstSpotPainter(turtle.RawTurtle):
     """
     Class for Spot Painting.
     Note: For generating colors from image file it takes some time. For faster working use higher color value.
@@ -27,13 +233,29 @@ class HirstSpotPainter(turtle.Turtle):
 
     COLORTUPLE = Union[str, Tuple[int, int, int]]
     PATTERNS = ('square', 'circle')
+    QUANTIZERS = ('mmcq', 'kmeans')
+    DOTSIZE = 15
+    STEPSIZE = 25
+
+    # Padding size around the paint.
+    PADDING = 50
+
+    # Above this many spots, painting blits one Pillow-rendered bitmap
+    # instead of creating individual canvas oval items.
+    BITMAP_THRESHOLD = 2000
+
+    # Extracted palettes keyed by image path, mtime and extraction parameters,
+    # so resizes/repaints don't re-run quantization on unchanged inputs.
+    _palette_cache: dict = {}
+    _palette_cache_loaded = False
 
-    __slots__ = '_screen', '_wsize', '_colors', '_image_file', '_ccount', '_cquality', '_pattern'
+    __slots__ = ('_screen', '_root', '_canvas', '_wsize', '_layout', '_colors', '_colors_tk', '_image_file',
+                 '_ccount', '_cquality', '_pattern', '_pattern_impl', '_quantizer', '_photo')
 
     def __init__(self, size: Tuple[int, int] = (500, 500),
                  colors: Sequence[COLORTUPLE] = ('red', 'green', 'blue'),
                  image_file: str = '', color_quality: int = 5, color_count: int = 20,
-                 pattern: str = 'square') -> None:
+                 pattern: str = 'square', quantizer: str = 'mmcq') -> None:
         """
         Creates HirstSpotPainter instance. If the image parameter is given colors
         parameter will not be considered.
@@ -43,25 +265,39 @@ class HirstSpotPainter(turtle.Turtle):
                        (Default: ('red', 'blue', 'green'))
         :param image_file: Takes a file with location.
         :param color_quality: Quality of colors extracted from image. 1 means higher color quality.
-                              Higher the quality increase the process time on images. (Default: 5)
+                              Acts as a subsampling stride in both image dimensions, so higher
+                              values reduce process time quadratically. (Default: 5)
         :param color_count: Maximum number of colors to be extracted from image. (Default: 20)
         :param pattern: Takes a pattern name. There are 2 types patterns, square and circle.
                         (Default: 'square')
+        :param quantizer: Takes a quantizer name used for extracting colors from image.
+                          There are 2 quantizers, mmcq and kmeans. The kmeans quantizer
+                          needs scikit-learn installed. (Default: 'mmcq')
         """
         if color_quality < 1 or color_count < 1:
             raise ValueError('Color quality and count must be greater than 1')
 
         self._hspscreen: Union[turtle.TurtleScreen, None] = None
         self._image_file = ''
-        self._colors = colors
+        self._set_colors(colors)
         self._cquality = color_quality
         self._ccount = color_count
 
+        if quantizer in self.QUANTIZERS:
+            self._quantizer = quantizer
+        else:
+            raise ValueError(f'Quantizer should be one of the {self.QUANTIZERS}')
+        if quantizer == 'kmeans' and MiniBatchKMeans is None:
+            raise ImportError("scikit-learn is required for the 'kmeans' quantizer")
+
         if pattern in self.PATTERNS:
-            self._pattern = pattern
+            self._set_pattern(pattern)
         else:
             raise ValueError(f'Pattern should be one of the {self.PATTERNS}')
 
+        # While _hspscreen is still None, screen_size and refresh_image only
+        # record state and skip their clear/repaint blocks, so the painting
+        # below runs exactly once during construction.
         self.screen_size(*size)
         self.refresh_image(image_file)
         self._setup_turtle()
@@ -72,80 +308,180 @@ class HirstSpotPainter(turtle.Turtle):
         Clears the current screen and preserve footer.
         """
         self.clear()
+        if self._hspscreen:
+            self._hspscreen.getcanvas().delete('hsp_spot')
         self._set_footer()
 
-    def _build_colors(self) -> None:
+    @staticmethod
+    def _coerce_colors(colors: Sequence[COLORTUPLE]) -> np.ndarray:
         """
-        Rebuild the color from image file.
+        Coerces a color sequence to a NumPy array for bulk indexing.
+
+        RGB tuples become a (K, 3) uint8 array, tkinter color strings a 1D
+        string array and mixed sequences an object array.
+
+        :param colors: Takes collection of color tuples or strings.
+        :return: An array with one color per row/entry.
         """
-        if self._image_file:
-            print('Generating colors from image, please wait sometimes...')
-            self._colors = ColorThief(self._image_file).get_palette(self._ccount, self._cquality)
+        try:
+            arr = np.asarray(colors)
+        except ValueError:
+            # Mixed strings and tuples don't stack into a regular shape.
+            arr = np.empty(len(colors), dtype=object)
+            arr[:] = list(colors)
+        if arr.ndim == 2 and np.issubdtype(arr.dtype, np.number):
+            arr = arr.astype(np.uint8)
+        return arr
+
+    def _set_pattern(self, pattern: str) -> None:
+        """
+        Stores the pattern name and binds its spot builder for _paint.
 
-    def _square_pattern(self):
+        :param pattern: Takes a string which must be one of the patterns.
         """
-        Paints square pattern.
+        self._pattern = pattern
+        self._pattern_impl = {'square': self._square_pattern,
+                              'circle': self._circle_pattern}[pattern]
+
+    def _set_colors(self, colors: Sequence[COLORTUPLE]) -> None:
         """
-        # Padding size around the paint.
-        PADX = PADY = 50
+        Stores colors along with a tk-ready string form.
 
-        # Calculations.
-        startx, starty = -(int(self._wsize[0] / 2) - PADX), -(int(self._wsize[1] / 2) - PADY)
-        DOTSIZE = 15
-        STEPSIZE = 25
-        dotcountx = int(self._wsize[0] - (2 * PADX)) // STEPSIZE
-        dotcounty = int(self._wsize[1] - (2 * PADY)) // STEPSIZE
+        Formatting '#rrggbb' once per palette color means the per-dot draw
+        calls skip turtle's color validation and tk's tuple parsing.
 
-        # Painting dots.
-        self.up()
-        for i in range(dotcounty + 1):
-            self.goto(startx, starty + (STEPSIZE * i))
-            self.dot(DOTSIZE, self._yield_color())
-            for j in range(dotcountx):
-                self.fd(STEPSIZE)
-                self.dot(DOTSIZE, self._yield_color())
+        :param colors: Takes collection of color tuples or strings.
+        """
+        self._colors = self._coerce_colors(colors)
+        self._colors_tk = np.asarray([color if isinstance(color, str) else '#%02x%02x%02x' % tuple(color)
+                                      for color in self._colors])
 
-    def _circle_pattern(self):
+    def _build_colors(self) -> None:
         """
-        Paints circle pattern.
+        Rebuild the color from image file.
         """
-        # Padding size.
-        PAD = 50
-        DOTSIZE = 15
-        STEPSIZE = 25
+        if self._image_file:
+            self._load_palette_cache()
+            key = (os.path.abspath(self._image_file), os.path.getmtime(self._image_file),
+                   self._ccount, self._cquality, self._quantizer)
+            if key in self._palette_cache:
+                palette = self._palette_cache[key]
+            else:
+                print('Generating colors from image, please wait sometimes...')
+                palette = _extract_palette(self._image_file, self._ccount, self._cquality, self._quantizer)
+                self._palette_cache[key] = palette
+            self._set_colors(palette)
+
+    @classmethod
+    def _load_palette_cache(cls) -> None:
+        """
+        Loads the on-disk palette cache once and schedules saving it on exit.
+        """
+        if not cls._palette_cache_loaded:
+            cls._palette_cache_loaded = True
+            try:
+                with open(_CACHE_FILE, 'rb') as file:
+                    cls._palette_cache.update(pickle.load(file))
+            except (OSError, pickle.PickleError, EOFError):
+                pass
+            atexit.register(cls._save_palette_cache)
+
+    @classmethod
+    def _save_palette_cache(cls) -> None:
+        """
+        Persists the palette cache to disk.
+        """
+        try:
+            os.makedirs(os.path.dirname(_CACHE_FILE), exist_ok=True)
+            with open(_CACHE_FILE, 'wb') as file:
+                pickle.dump(cls._palette_cache, file)
+        except OSError:
+            pass
+
+    def _square_pattern(self) -> np.ndarray:
+        """
+        Computes spot centers for square pattern.
+
+        :return: An (N, 2) array of (x, y) spot centers in turtle coordinates.
+        """
+        layout = self._layout
+        xs = layout.startx + (self.STEPSIZE * np.arange(layout.dotcountx + 1))
+        ys = layout.starty + (self.STEPSIZE * np.arange(layout.dotcounty + 1))
+        gridx, gridy = np.meshgrid(xs, ys)
+        return np.stack((gridx.ravel(), gridy.ravel()), axis=1)
 
-        # Calculations.
-        min_size = self._wsize[0] if self._wsize[0] < self._wsize[1] else self._wsize[1]
-        cir_counts = ((min_size // 2) - PAD) // STEPSIZE
+    def _circle_pattern(self) -> np.ndarray:
+        """
+        Computes spot centers for circle pattern.
+
+        :return: An (N, 2) array of (x, y) spot centers in turtle coordinates.
+        """
+        STEPSIZE = self.STEPSIZE
+        step_inv = 1.0 / STEPSIZE
         startx, starty = 0, 5
 
-        # Painting dots.
-        self.up()
-        self.goto(startx, starty)
-        self.dot(DOTSIZE, self._yield_color())
-        for i in range(cir_counts):
+        rings = [np.array([[startx, starty]])]
+        for i in range(self._layout.cir_counts):
             radius = STEPSIZE + (STEPSIZE * i)
-            self.goto(startx, starty - radius)
-            self.setheading(0)
-            # self.circle(radius, randint(0, 45))
-            dot_counts = math.floor((2 * math.pi * radius) / STEPSIZE)
-            deg = 360 / dot_counts
+            dot_counts = int(_TAU * radius * step_inv)
 
-            for j in range(dot_counts):
-                self.dot(DOTSIZE, self._yield_color())
-                self.circle(radius, deg)
+            # Rings start at the bottom and run counterclockwise, like the
+            # old turtle.circle() walk did.
+            theta = np.linspace(-np.pi / 2, 3 * np.pi / 2, dot_counts, endpoint=False)
+            rings.append(np.stack((startx + (radius * np.cos(theta)),
+                                   starty + (radius * np.sin(theta))), axis=1))
+        return np.concatenate(rings)
 
     def _paint(self) -> None:
         """
-        Starts paints on the screen.
+        Paints current pattern on the screen in one batch.
+
+        Spots are drawn directly on the underlying tkinter canvas with the
+        tracer disabled, so the whole pattern shows up in a single update
+        instead of one animation step per dot. Mid-paint animation is lost,
+        but painting is short and the interactive tracer(2) is restored for
+        everything outside _paint.
         """
+        spots = self._pattern_impl()
+        canvas = self._hspscreen.getcanvas()
+        radius = self.DOTSIZE / 2
+        # One C-level RNG call for all spots beats per-spot choice().
+        colors = self._yield_colors_bulk(len(spots))
+        self._hspscreen.tracer(0)
+        try:
+            if len(spots) >= self.BITMAP_THRESHOLD:
+                self._paint_bitmap(canvas, spots, colors, radius)
+            else:
+                for (x, y), color in zip(spots, colors):
+                    # Canvas y axis points down, turtle's points up.
+                    canvas.create_oval(x - radius, -y - radius, x + radius, -y + radius,
+                                       fill=color, outline=color, tags='hsp_spot')
+        finally:
+            self._hspscreen.update()
+            self._hspscreen.tracer(2)
+
+    def _paint_bitmap(self, canvas, spots, colors, radius: float) -> None:
+        """
+        Renders all spots into one transparent Pillow image and blits it to
+        the canvas as a single item.
 
-        if self._pattern == 'square':
-            self._square_pattern()
-        elif self._pattern == 'circle':
-            self._circle_pattern()
-        else:
-            raise ValueError(f'Invalid pattern {self._pattern!r}')
+        One bitmap upload replaces thousands of canvas oval items, each of
+        which would be a round trip into tk's canvas item system.
+
+        :param canvas: Takes the underlying tkinter canvas.
+        :param spots: Takes the (x, y) spot centers in turtle coordinates.
+        :param colors: Takes one tk color string per spot.
+        :param radius: Takes the spot radius in pixels.
+        """
+        width, height = int(self._wsize[0]), int(self._wsize[1])
+        img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(img)
+        for (x, y), color in zip(spots, colors):
+            px, py = (width / 2) + x, (height / 2) - y
+            draw.ellipse((px - radius, py - radius, px + radius, py + radius), fill=str(color))
+        # Keep a reference on self, tk does not hold one itself.
+        self._photo = ImageTk.PhotoImage(img)
+        canvas.create_image(0, 0, image=self._photo, anchor='center', tags='hsp_spot')
 
     def _set_footer(self):
         """
@@ -162,25 +498,44 @@ class HirstSpotPainter(turtle.Turtle):
     def _setup_turtle(self) -> None:
         """
         Setup turtle as given parameters.
+
+        Builds an own Tk root, canvas and TurtleScreen instead of going
+        through turtle's global Screen() singleton, so no module-level state
+        is touched and repeated resizes skip the singleton re-setup.
         """
         if not self._hspscreen:
-            super().__init__(visible=False)
-            self._hspscreen = self.getscreen()
-        self._hspscreen.setup(*self._wsize)
-        self._hspscreen.screensize(self._wsize[0] - 30, self._wsize[1] - 30)
+            self._root = tkinter.Tk()
+            self._canvas = tkinter.Canvas(self._root, width=self._wsize[0], height=self._wsize[1],
+                                          highlightthickness=0)
+            self._canvas.pack(expand=True, fill='both')
+            self._hspscreen = turtle.TurtleScreen(self._canvas)
+            super().__init__(self._hspscreen, visible=False)
+        self._root.title('Hirst Spot Painting')
+        self._root.geometry(f'{self._wsize[0]}x{self._wsize[1]}')
+        self._canvas.config(width=self._wsize[0], height=self._wsize[1],
+                            scrollregion=(-self._wsize[0] // 2, -self._wsize[1] // 2,
+                                          self._wsize[0] // 2, self._wsize[1] // 2))
         self._hspscreen.tracer(2)
         self.speed(9)
-        self._hspscreen.title('Hirst Spot Painting')
         self._hspscreen.colormode(255)
         self._set_footer()
 
-    def _yield_color(self) -> Union[str, COLORTUPLE]:
+    def _yield_color(self) -> str:
         """
         Yields color from colors in random manner.
 
-        :return: A color tuple contains RGB values.
+        :return: A tk-ready color string.
+        """
+        return choice(self._colors_tk)
+
+    def _yield_colors_bulk(self, count: int) -> np.ndarray:
+        """
+        Yields tk-ready colors for the given number of spots in one RNG call.
+
+        :param count: Takes the number of colors wanted.
+        :return: An array of color strings with one entry per spot.
         """
-        return choice(self._colors)
+        return self._colors_tk[np.random.randint(0, len(self._colors_tk), count)]
 
     def change_colors(self, colors: Sequence[COLORTUPLE]) -> None:
         """
@@ -188,7 +543,7 @@ class HirstSpotPainter(turtle.Turtle):
 
         :param colors: Takes collection of color tuples.
         """
-        self._colors = colors
+        self._set_colors(colors)
         if self._image_file:
             self._image_file = ''
         self.__clear()
@@ -202,7 +557,7 @@ class HirstSpotPainter(turtle.Turtle):
         :param pattern: Takes a string which must be one of the patterns.
         """
         if pattern in self.PATTERNS:
-            self._pattern = pattern
+            self._set_pattern(pattern)
             self.__clear()
             self._paint()
         else:
@@ -215,6 +570,32 @@ class HirstSpotPainter(turtle.Turtle):
         if self._hspscreen:
             self._hspscreen.mainloop()
 
+    @classmethod
+    def preload_palettes(cls, files: Sequence[str], color_quality: int = 5, color_count: int = 20,
+                         quantizer: str = 'mmcq') -> dict:
+        """
+        Extracts palettes for several images in parallel and warms the cache.
+
+        Extraction is CPU bound and independent per image, so it scales with
+        cores. Later refresh_image calls on these files become cache lookups.
+
+        :param files: Takes a collection of image files with location.
+        :param color_quality: Quality of colors extracted from images. (Default: 5)
+        :param color_count: Maximum number of colors to be extracted per image. (Default: 20)
+        :param quantizer: Takes a quantizer name, 'mmcq' or 'kmeans'. (Default: 'mmcq')
+        :return: A dict mapping each file to its extracted palette.
+        """
+        cls._load_palette_cache()
+        palettes = {}
+        with ProcessPoolExecutor(max_workers=os.cpu_count()) as pool:
+            futures = {file: pool.submit(_extract_palette, file, color_count, color_quality, quantizer)
+                       for file in files}
+            for file, future in futures.items():
+                palettes[file] = future.result()
+                key = (os.path.abspath(file), os.path.getmtime(file), color_count, color_quality, quantizer)
+                cls._palette_cache[key] = palettes[file]
+        return palettes
+
     def screen_size(self, x: int = None, y: int = None) -> Union[None, Tuple[int, int]]:
         """
         Returns current screen size if no arguments are passed. If x, y argument is given, changes the screensize
@@ -228,6 +609,17 @@ class HirstSpotPainter(turtle.Turtle):
             if x < 300 or y < 100:
                 raise ValueError(f'Minimum value (300, 100), given ({x}, {y})')
             self._wsize = (x, y)
+
+            # Layout values derived from the window size, computed once per
+            # resize so the pattern methods stay off this arithmetic.
+            min_size = min(x, y)
+            self._layout = SimpleNamespace(
+                startx=-(int(x / 2) - self.PADDING),
+                starty=-(int(y / 2) - self.PADDING),
+                dotcountx=int(x - (2 * self.PADDING)) // self.STEPSIZE,
+                dotcounty=int(y - (2 * self.PADDING)) // self.STEPSIZE,
+                min_size=min_size,
+                cir_counts=((min_size // 2) - self.PADDING) // self.STEPSIZE)
             if self._hspscreen:
                 self.__clear()
                 self._setup_turtle()